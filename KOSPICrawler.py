@@ -1,4 +1,4 @@
-import os, sys
+import os, sys, re, hashlib
 
 import bs4
 
@@ -10,6 +10,10 @@ from bs4 import BeautifulSoup
 #from collections import OrderedDict
 from CorpFinance import CorpFinance
 
+class LayoutChangedError(Exception):
+    """네이버 금융 페이지 레이아웃이 변경되어 재무정보를 찾을 수 없을 때 발생한다."""
+    pass
+
 class KOSPICrawler(Crawler):
     """KOSPI 종목을 크롤링한다."""
 
@@ -18,6 +22,19 @@ class KOSPICrawler(Crawler):
         #self.url = url
         self._KOSPI_CODE = 'Y'
         self._STOCK_DB = '/Users/hanbeomman/Documents/stock/DB'
+        ## 기업실적분석 테이블의 (재무항목: 행 제목)
+        self._FIN_LABELS = {'revenue': '매출액', 'operating_income': '영업이익',
+                            'net_profit': '당기순이익', 'operating_income_rate': '영업이익률',
+                            'net_profit_rate': '순이익률', 'roe': 'ROE',
+                            'liability_rate': '부채비율', 'quick_rate': '당좌비율',
+                            'per': 'PER', 'pbr': 'PBR'}
+        ## 요약 테이블의 (항목: 행 제목)
+        self._SUMMARY_LABELS = {'stocks_listed': '상장주식수'}
+        ## (레이아웃 지문: 행/열 맵) 캐시
+        self._layouts = dict()
+        ## 정보를 얻지 못한 페이지가 연속으로 이 횟수에 이르면 레이아웃 변경(혹은 차단)으로 판단
+        self._MAX_BAD_PAGES = 10
+        self._bad_page_count = 0
 
     def _set_api_key(self) -> None:
         """DART Open 서비스 이용을 위한 api_key 입력"""
@@ -79,7 +96,13 @@ class KOSPICrawler(Crawler):
             corp_name = corp[1]
             stock_code = corp[2]
             print(f'> Process {curr+1}th corp: {corp_name}...')
-            corp_info = self._scrap_naver_fin_page(corp_code, corp_name, stock_code)
+            try:
+                corp_info = self._scrap_naver_fin_page(corp_code, corp_name, stock_code)
+            except LayoutChangedError as e:
+                ## 잘못된 데이터로 전체 크롤링(및 요청 횟수)을 낭비하지 않도록 조기 종료
+                print(f'> [ERROR] {e}')
+                print(f'> [ERROR] Abort crawling at {curr+1}th corp: {corp_name}...')
+                return
             print(corp_info)
 
         return
@@ -104,6 +127,167 @@ class KOSPICrawler(Crawler):
 
         return tag_text
 
+    def _normalize_label(self, text: str) -> str:
+        """'ROE(지배주주)', 'PER(배)' -> 'ROE', 'PER' 와 같이 괄호 및 공백을 제거한다."""
+
+        text = re.sub(r'\(.*?\)', '', text)
+        text = re.sub(r'\s+', '', text)
+
+        return text
+
+    def _table_labels(self, soup: BeautifulSoup, css_rows: str) -> list:
+        """css_rows로 선택한 행들의 제목(th)을 정규화하여 행 순서대로 돌려준다."""
+
+        labels = []
+        for row in soup.select(css_rows):
+            th = row.select_one('th')
+            labels.append('' if th is None else self._normalize_label(th.get_text()))
+
+        return labels
+
+    def _layout_fingerprint(self, soup: BeautifulSoup, css_summary: str, css_corp_analysis: str) -> tuple:
+        """시가총액 요약 테이블, 기업실적분석 테이블의 행 제목(label)과 열 제목 구조로 페이지 레이아웃 지문을 만든다.
+        열 제목은 년도 값 대신 그룹(연간/분기)과 형태('2021.12(E)' -> '0000.00(E)')만 사용하므로
+        결산월, 조회 시점이 달라도 같은 레이아웃이면 같은 지문을 갖는다.
+
+        Parameters
+        ----------
+        soup: BeautifulSoup
+            soup 객체 (html parser)
+        css_summary: str
+            시가총액, 상장주식수 등 요약 테이블의 css 선택자
+        css_corp_analysis: str
+            기업실적분석 섹션의 css 선택자
+
+        Returns
+        -------
+        tuple of (str, list of str, list of str, list of tuple)
+            (레이아웃 지문, 요약 테이블 label 리스트, 기업실적분석 label 리스트,
+            열 순서대로의 (그룹, 열 형태) 리스트), 두 테이블 모두 행이 없으면 (None, [], [], [])
+        """
+
+        css_table = f'{css_corp_analysis} > div.sub_section > table'
+
+        summary_labels = self._table_labels(soup, f'{css_summary} > tr')
+        labels = self._table_labels(soup, f'{css_table} > tbody > tr')
+
+        if len(summary_labels) == 0 and len(labels) == 0:
+            return None, [], [], []
+
+        ## thead 첫 행: 그룹 제목(최근 연간 실적, 최근 분기 실적)과 colspan
+        groups = []
+        for th in soup.select(f'{css_table} > thead > tr:nth-of-type(1) > th'):
+            if int(th.get('rowspan', 1)) > 1:
+                continue
+            groups += [self._normalize_label(th.get_text())] * int(th.get('colspan', 1))
+
+        ## thead 둘째 행: 각 열의 기간 제목
+        columns = []
+        for c_idx, th in enumerate(soup.select(f'{css_table} > thead > tr:nth-of-type(2) > th')):
+            group = groups[c_idx] if c_idx < len(groups) else ''
+            shape = re.sub(r'\d', '0', re.sub(r'\s+', '', th.get_text()))
+            columns.append((group, shape))
+
+        key = '|'.join(summary_labels) + '#' + '|'.join(labels) + '#' + '|'.join(f'{g}:{c}' for g, c in columns)
+        fingerprint = hashlib.md5(key.encode('utf8')).hexdigest()
+
+        return fingerprint, summary_labels, labels, columns
+
+    def _layout_map(self, soup: BeautifulSoup, css_summary: str, css_corp_analysis: str) -> dict or None:
+        """레이아웃 지문에 해당하는 행/열 맵을 돌려준다.
+        지문별로 한 번만 label을 탐색하고, 이후 같은 지문의 페이지에서는 캐시된 맵을 재사용한다.
+
+        Parameters
+        ----------
+        soup: BeautifulSoup
+            soup 객체 (html parser)
+        css_summary: str
+            시가총액, 상장주식수 등 요약 테이블의 css 선택자
+        css_corp_analysis: str
+            기업실적분석 섹션의 css 선택자
+
+        Returns
+        -------
+        dict or None
+            {'summary': (요약항목: tr nth-of-type 번호),
+             'rows': (재무항목: tr nth-of-type 번호),
+             'cols': 연간 실적(추정치 제외) 열의 td nth-of-type 번호 리스트},
+            기업실적분석 섹션이 없는 기업이면 'rows', 'cols'는 None,
+            두 테이블 모두 없으면 None
+
+        Raises
+        ------
+        LayoutChangedError
+            섹션은 있으나 테이블을 찾지 못하거나, 필요한 label을 찾지 못한 경우
+        """
+
+        fingerprint, summary_labels, labels, columns = self._layout_fingerprint(soup, css_summary, css_corp_analysis)
+        if fingerprint is None:
+            return None
+
+        if fingerprint in self._layouts:
+            return self._layouts[fingerprint]
+
+        if len(self._layouts) > 0:
+            print(f'> [WARNING] New page layout detected: {fingerprint}')
+
+        summary_map = dict()
+        missing = []
+        for item, label in self._SUMMARY_LABELS.items():
+            if label in summary_labels:
+                summary_map[item] = summary_labels.index(label) + 1
+            else:
+                missing.append(label)
+
+        if len(missing) > 0:
+            raise LayoutChangedError(f'Unknown page layout {fingerprint}, missing labels: {missing}')
+
+        layout = {'summary': summary_map, 'rows': None, 'cols': None}
+
+        if len(labels) == 0:
+            ## 섹션 자체가 있는데 행을 못 찾으면 테이블 구조가 바뀐 것
+            if soup.select_one(css_corp_analysis) is not None:
+                raise LayoutChangedError(f'Unknown page layout {fingerprint}, no rows in table of {css_corp_analysis}')
+            self._layouts[fingerprint] = layout
+            return layout
+
+        row_map = dict()
+        for item, label in self._FIN_LABELS.items():
+            if label in labels:
+                row_map[item] = labels.index(label) + 1
+            else:
+                missing.append(label)
+
+        if len(missing) > 0:
+            raise LayoutChangedError(f'Unknown page layout {fingerprint}, missing labels: {missing}')
+
+        cols = [ c_idx+1 for c_idx, (group, shape) in enumerate(columns)
+                 if '연간' in group and '(E)' not in shape ]
+        if len(cols) == 0:
+            raise LayoutChangedError(f'Unknown page layout {fingerprint}, no annual columns: {columns}')
+
+        layout['rows'] = row_map
+        layout['cols'] = cols
+        self._layouts[fingerprint] = layout
+
+        return layout
+
+    def _count_bad_page(self, reason: str) -> None:
+        """정보를 얻지 못한 페이지 수를 센다.
+        개별 기업의 정보 누락(신규 상장 등)은 있을 수 있으나, 연속되면 레이아웃 변경이나 요청 차단으로 판단한다.
+
+        Raises
+        ------
+        LayoutChangedError
+            정보를 얻지 못한 페이지가 연속으로 _MAX_BAD_PAGES 번 이상인 경우
+        """
+
+        self._bad_page_count += 1
+        print(f'> [WARNING] {reason} ({self._bad_page_count} pages in a row)')
+        if self._bad_page_count >= self._MAX_BAD_PAGES:
+            raise LayoutChangedError(f'{self._bad_page_count} pages in a row without info, last: {reason}')
+        return
+
     def _numeric(self, text: str) -> int or float or None:
 
         try:
@@ -144,6 +328,11 @@ class KOSPICrawler(Crawler):
         -------
         CorpFinance
             각 정보(재무정보 포함)가 포함된 CorpFinance 클래스
+
+        Raises
+        ------
+        LayoutChangedError
+            페이지 레이아웃이 변경되었거나, 정보를 얻지 못한 페이지가 연속된 경우
         """
 
         print(f'> Scrap naver page: {corp_name}, {corp_code}, {stock_code}')
@@ -158,6 +347,8 @@ class KOSPICrawler(Crawler):
         if response.status_code == 200:
             soup = BeautifulSoup(response.text, 'html.parser')
         else:
+            ## 요청이 차단된 경우에도 요청 횟수를 계속 소모하지 않도록 함께 셈
+            self._count_bad_page(f'Invalid response: {response.status_code}')
             return CorpFinance('', '', '')
 
         corp_fin = CorpFinance(corp_name, corp_code, stock_code)
@@ -193,9 +384,18 @@ class KOSPICrawler(Crawler):
             stocks_listed = None        
         """
 
+        css_summary = '#tab_con1 > div.first > table'
+        css_corp_analysis = f'div.section.cop_analysis'
+
+        ## 행/열 위치는 고정값 대신 레이아웃 지문(fingerprint)별 label -> 행/열 번호 맵을 사용
+        layout = self._layout_map(soup, css_summary, css_corp_analysis)
+        if layout is None:
+            self._count_bad_page(f'No summary table: {corp_name}')
+            return corp_fin
+
         market_capital = self._soup_get_text(soup, '#_market_sum')
 
-        css_selector  = '#tab_con1 > div.first > table > tr:nth-of-type(3) > td > em'
+        css_selector  = f'{css_summary} > tr:nth-of-type({layout["summary"]["stocks_listed"]}) > td > em'
         stocks_listed = self._soup_get_text(soup, css_selector)
         if stocks_listed is not None:
             stocks_listed = int(stocks_listed.replace(',',''))
@@ -203,109 +403,113 @@ class KOSPICrawler(Crawler):
         corp_fin.set_market_cap(market_capital)
         corp_fin.set_stocks_listed(stocks_listed)
 
-        if market_capital is not None and stocks_listed is not None:
-            css_corp_analysis = f'div.section.cop_analysis'
-
-            ## 과거 3개년 년도
-            """
-            > 과거 3개년 연도 정보
-            '#content > div.section.cop_analysis > div.sub_section > table > thead > tr:nth-child(2) > th:nth-child(1)'
-            '#content > div.section.cop_analysis > div.sub_section > table > thead > tr:nth-child(2) > th:nth-child(2)'
-            '#content > div.section.cop_analysis > div.sub_section > table > thead > tr:nth-child(2) > th:nth-child(3)'
-    
-            > 최근 5개 분기 분기 정보
-            '#content > div.section.cop_analysis > div.sub_section > table > thead > tr:nth-child(2) > th:nth-child(5)'
-            '#content > div.section.cop_analysis > div.sub_section > table > thead > tr:nth-child(2) > th:nth-child(6)'
-            ...
-            
-            '#content > div.section.cop_analysis > div.sub_section > table > thead > tr:nth-child(2) > th:nth-child(1)'    
-            """
-            years = []
-            for i in range(1, 4):
-                css_selector = f'{css_corp_analysis} > div.sub_section > table > thead > tr:nth-of-type(2) > th:nth-of-type({i})'
-                year = self._soup_get_text(soup, css_selector)
-                years.append(year)
-            #print(years); sys.exit()
-
-            """
-            > 재무정보 단위 (억원??)
-            매출액:    '#content > div.section.cop_analysis > div.sub_section > table > tbody > tr:nth-child(1) > th'
-            영억이익:   '#content > div.section.cop_analysis > div.sub_section > table > tbody > tr:nth-child(2) > th'
-            당기순이익: '#content > div.section.cop_analysis > div.sub_section > table > tbody > tr:nth-child(3) > th'
-            
-            financial_info = ['매출액', '영업이익', '당기순이익',\
-                              '영업이익률', '순이익률', 'ROE',\
-                              '부채비율', '당좌비율', 'PER', 'PBR']
-            #first_fin = ['매출액', '영업이익', '당기순이익']
-            for i in range(1, 9):
-                css_selector = f'div.sub_section > table > tbody > tr:nth-child({i}) > th'
-                unit = corp_analysis.select_one(css_selector)
-                unit = unit.get_text().strip()
-            """
-            """
-            > 과거 3년 주요 재무정보
-            매출액: '#content > div.section.cop_analysis > div.sub_section > table > tbody > tr:nth-child(1) > td:nth-child(2,3,4)'
-            영업익: '#content > div.section.cop_analysis > div.sub_section > table > tbody > tr:nth-child(2) > td:nth-child(2,3,4)'
-            당기익: '#content > div.section.cop_analysis > div.sub_section > table > tbody > tr:nth-child(3) > td:nth-child(2,3,4)'
-            """
-            financial_item = ['revenue', 'operating_income', 'net_profit',\
-                              'operating_income_rate', 'net_profit_rate',\
-                              'roe', 'liability_rate', 'quick_rate', 'per', 'pbr']
-
-            """
-            '#content > div.section.cop_analysis > div.sub_section > table > tbody > tr:nth-child(1) > td:nth-child(2)'
-            '#content > div.section.cop_analysis > div.sub_section > table > tbody > tr:nth-child(2) > td:nth-child(2)'
-            '#content > div.section.cop_analysis > div.sub_section > table > tbody > tr:nth-child(11) > td:nth-child(2)'
-            '#content > div.section.cop_analysis > div.sub_section > table > tbody > tr:nth-child(13) > td:nth-child(2)'
-            #content > div.section.cop_analysis > div.sub_section > table > tbody > tr:nth-child(11) > td:nth-child(2)
-            """
-            total_fin_info = dict()
-            for f_idx, item in enumerate(financial_item):
-                if item == 'per':
-                    item_css_selector = f'{css_corp_analysis} > div.sub_section > table > tbody > tr:nth-of-type({11})'
-                elif item == 'pbr':
-                    item_css_selector = f'{css_corp_analysis} > div.sub_section > table > tbody > tr:nth-of-type({13})'
-                else:
-                    item_css_selector = f'{css_corp_analysis} > div.sub_section > table > tbody > tr:nth-of-type({f_idx+1})'
-                each_fin_info = dict()
-                for y_idx, year in enumerate(years):
-                    css_selector = f'{item_css_selector} > td:nth-of-type({y_idx+1})'
-                    #tag = soup.select_one(css_selector)
-                    tag = self._soup_get_text(soup, css_selector)
-                    if tag is not None:
-                        tag = tag.replace(',','')
-                        tag = self._numeric(tag)
-                    """
-                    try:
-                        tag_text = tag.get_text().strip().replace(',', '')  ## '2,437,714' -> '2437714'
-                    except AttributeError:
-                        tag_text = None
-                        tag_val  = None
-                        each_fin_info[year] = tag_val
-                        continue
-
-                    if tag_text == '':
-                        each_fin_info[year] = None
-                        continue
-
-                    try:
-                        tag_val = int(tag_text)
-                    except ValueError:
-                        tag_val = float(tag_text)
-                    """
-                    each_fin_info[year] = tag
-                total_fin_info[item] = each_fin_info
-
-            corp_fin.set_revenue(total_fin_info['revenue'])
-            corp_fin.set_operating_income(total_fin_info['operating_income'])
-            corp_fin.set_operating_income_rate(total_fin_info['operating_income_rate'])
-            corp_fin.set_net_profit(total_fin_info['net_profit'])
-            corp_fin.set_net_profit_rate(total_fin_info['net_profit_rate'])
-            corp_fin.set_roe(total_fin_info['roe'])
-            corp_fin.set_liability_rate(total_fin_info['liability_rate'])
-            corp_fin.set_quick_rate(total_fin_info['quick_rate'])
-            corp_fin.set_per(total_fin_info['per'])
-            corp_fin.set_pbr(total_fin_info['pbr'])
+        if market_capital is None or stocks_listed is None:
+            self._count_bad_page(f'No market capital or stocks listed: {corp_name}')
+            return corp_fin
+
+        ## 기업실적분석 섹션이 없는 기업(신규 상장 등)
+        if layout['rows'] is None:
+            self._count_bad_page(f'No corp analysis table: {corp_name}')
+            return corp_fin
+
+        ## 과거 3개년 년도
+        """
+        > 과거 3개년 연도 정보
+        '#content > div.section.cop_analysis > div.sub_section > table > thead > tr:nth-child(2) > th:nth-child(1)'
+        '#content > div.section.cop_analysis > div.sub_section > table > thead > tr:nth-child(2) > th:nth-child(2)'
+        '#content > div.section.cop_analysis > div.sub_section > table > thead > tr:nth-child(2) > th:nth-child(3)'
+
+        > 최근 5개 분기 분기 정보
+        '#content > div.section.cop_analysis > div.sub_section > table > thead > tr:nth-child(2) > th:nth-child(5)'
+        '#content > div.section.cop_analysis > div.sub_section > table > thead > tr:nth-child(2) > th:nth-child(6)'
+        ...
+        
+        '#content > div.section.cop_analysis > div.sub_section > table > thead > tr:nth-child(2) > th:nth-child(1)'    
+        """
+        row_map = layout['rows']
+
+        ## (td nth-of-type 번호: 년도), 추정치(E)를 제외한 연간 실적 열만 사용
+        years = dict()
+        for col in layout['cols']:
+            css_selector = f'{css_corp_analysis} > div.sub_section > table > thead > tr:nth-of-type(2) > th:nth-of-type({col})'
+            years[col] = self._soup_get_text(soup, css_selector)
+        #print(years); sys.exit()
+
+        """
+        > 재무정보 단위 (억원??)
+        매출액:    '#content > div.section.cop_analysis > div.sub_section > table > tbody > tr:nth-child(1) > th'
+        영억이익:   '#content > div.section.cop_analysis > div.sub_section > table > tbody > tr:nth-child(2) > th'
+        당기순이익: '#content > div.section.cop_analysis > div.sub_section > table > tbody > tr:nth-child(3) > th'
+        
+        financial_info = ['매출액', '영업이익', '당기순이익',\
+                          '영업이익률', '순이익률', 'ROE',\
+                          '부채비율', '당좌비율', 'PER', 'PBR']
+        #first_fin = ['매출액', '영업이익', '당기순이익']
+        for i in range(1, 9):
+            css_selector = f'div.sub_section > table > tbody > tr:nth-child({i}) > th'
+            unit = corp_analysis.select_one(css_selector)
+            unit = unit.get_text().strip()
+        """
+        """
+        > 과거 3년 주요 재무정보
+        매출액: '#content > div.section.cop_analysis > div.sub_section > table > tbody > tr:nth-child(1) > td:nth-child(2,3,4)'
+        영업익: '#content > div.section.cop_analysis > div.sub_section > table > tbody > tr:nth-child(2) > td:nth-child(2,3,4)'
+        당기익: '#content > div.section.cop_analysis > div.sub_section > table > tbody > tr:nth-child(3) > td:nth-child(2,3,4)'
+        """
+        financial_item = ['revenue', 'operating_income', 'net_profit',\
+                          'operating_income_rate', 'net_profit_rate',\
+                          'roe', 'liability_rate', 'quick_rate', 'per', 'pbr']
+
+        """
+        '#content > div.section.cop_analysis > div.sub_section > table > tbody > tr:nth-child(1) > td:nth-child(2)'
+        '#content > div.section.cop_analysis > div.sub_section > table > tbody > tr:nth-child(2) > td:nth-child(2)'
+        '#content > div.section.cop_analysis > div.sub_section > table > tbody > tr:nth-child(11) > td:nth-child(2)'
+        '#content > div.section.cop_analysis > div.sub_section > table > tbody > tr:nth-child(13) > td:nth-child(2)'
+        #content > div.section.cop_analysis > div.sub_section > table > tbody > tr:nth-child(11) > td:nth-child(2)
+        """
+        total_fin_info = dict()
+        for item in financial_item:
+            item_css_selector = f'{css_corp_analysis} > div.sub_section > table > tbody > tr:nth-of-type({row_map[item]})'
+            each_fin_info = dict()
+            for col, year in years.items():
+                css_selector = f'{item_css_selector} > td:nth-of-type({col})'
+                #tag = soup.select_one(css_selector)
+                tag = self._soup_get_text(soup, css_selector)
+                if tag is not None:
+                    tag = tag.replace(',','')
+                    tag = self._numeric(tag)
+                """
+                try:
+                    tag_text = tag.get_text().strip().replace(',', '')  ## '2,437,714' -> '2437714'
+                except AttributeError:
+                    tag_text = None
+                    tag_val  = None
+                    each_fin_info[year] = tag_val
+                    continue
+
+                if tag_text == '':
+                    each_fin_info[year] = None
+                    continue
+
+                try:
+                    tag_val = int(tag_text)
+                except ValueError:
+                    tag_val = float(tag_text)
+                """
+                each_fin_info[year] = tag
+            total_fin_info[item] = each_fin_info
+
+        corp_fin.set_revenue(total_fin_info['revenue'])
+        corp_fin.set_operating_income(total_fin_info['operating_income'])
+        corp_fin.set_operating_income_rate(total_fin_info['operating_income_rate'])
+        corp_fin.set_net_profit(total_fin_info['net_profit'])
+        corp_fin.set_net_profit_rate(total_fin_info['net_profit_rate'])
+        corp_fin.set_roe(total_fin_info['roe'])
+        corp_fin.set_liability_rate(total_fin_info['liability_rate'])
+        corp_fin.set_quick_rate(total_fin_info['quick_rate'])
+        corp_fin.set_per(total_fin_info['per'])
+        corp_fin.set_pbr(total_fin_info['pbr'])
+        self._bad_page_count = 0
 
         return corp_fin
 
@@ -406,7 +610,7 @@ if __name__ == '__main__':
     #crawler.run_naver()
     #corp = crawler._scrap_naver_fin_page('00177816','대주전자재료','078600')
     #corp = crawler._scrap_naver_fin_page('00126308','삼성엔지니어링','028050')
-    ## 개별 종목 이름으로 검색하기 추가, 2021년 스탯 추가, 동종업계 PER 추가, 동종업계 추가, 성장률, 구글 기사 스크랩
+    ## 개별 종목 이름으로 검색하기 추가, 2021년 스탯 추가, 동종업계 PER 추가, 동종업계 추가, 성장률, 구글 기사 스크랩 (-> NewsCrawler)
     #corp = crawler._scrap_naver_fin_page('00138224','쌍용씨앤이','003410')
     #corp = crawler._scrap_naver_fin_page('00162461','한화솔루션','009830')
     #corp = crawler._scrap_naver_fin_page('00159616', '두산중공업', '034020')
@@ -0,0 +1,654 @@
+import os, re, json, gzip, zlib, math, hashlib
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+from collections import OrderedDict, deque
+from urllib.parse import urljoin, urlparse, urlunparse, parse_qs, urlencode
+
+import requests
+from bs4 import BeautifulSoup
+
+from Crawler import Crawler
+
+def _atomic_write(path: str, data: bytes) -> None:
+    """임시 파일에 쓴 후 os.replace로 교체하여, 중단되어도 이전 파일이 깨지지 않도록 한다."""
+
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return
+
+_MASK64 = (1 << 64) - 1
+
+class BloomFilter(object):
+    """고정 크기 비트 배열을 사용하는 Bloom filter.
+    capacity개의 원소를 저장했을 때 오탐률이 error_rate가 되도록 크기를 정한다 (미탐 없음).
+
+    Attributes
+    ----------
+    n_bits: int
+        비트 배열 크기
+    n_hashes: int
+        원소당 사용하는 해시 개수
+    """
+
+    def __init__(self, capacity: int = 500000, error_rate: float = 0.001):
+        self.n_bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.n_hashes = max(1, round(self.n_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.n_bits + 7) // 8)
+        self._n_set = 0
+
+    def _positions(self, key: str):
+        """key에 대한 n_hashes개의 비트 위치를 생성한다 (double hashing)."""
+
+        digest = hashlib.sha1(key.encode('utf8')).digest()
+        h1 = int.from_bytes(digest[:8], 'big')
+        h2 = int.from_bytes(digest[8:16], 'big') | 1
+        for i in range(self.n_hashes):
+            yield (h1 + i * h2) % self.n_bits
+
+    def add(self, key: str) -> None:
+        for pos in self._positions(key):
+            if not self._bits[pos >> 3] & (1 << (pos & 7)):
+                self._bits[pos >> 3] |= 1 << (pos & 7)
+                self._n_set += 1
+        return
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    def fill_ratio(self) -> float:
+        """1로 설정된 비트의 비율. capacity만큼 저장되면 약 0.5가 된다."""
+        return self._n_set / self.n_bits
+
+    def save(self, path: str) -> None:
+        """비트 배열을 파일로 저장한다."""
+
+        _atomic_write(path, bytes(self._bits))
+        return
+
+    def load(self, path: str) -> None:
+        """저장된 비트 배열을 불러온다. 크기가 다르면 경고 후 무시한다."""
+
+        with open(path, 'rb') as f:
+            bits = f.read()
+        if len(bits) != len(self._bits):
+            print(f'> [WARNING] Bloom filter size mismatch, ignore {path}: {len(bits)} != {len(self._bits)} bytes')
+            return
+        self._bits = bytearray(bits)
+        self._n_set = sum(bin(byte).count('1') for byte in self._bits)
+        return
+
+class GenerationalBloomFilter(object):
+    """기간(period_days)별로 Bloom filter를 하나씩 두고 최근 generations개만 조회하는 필터.
+    오래된 기간의 필터는 삭제되므로 수집 기간이 길어져도 메모리와 오탐률이 일정하다.
+    각 기간의 필터는 [prefix].[기간 시작일].bin 파일로 저장된다.
+    """
+
+    def __init__(self, prefix: str, capacity: int = 500000, error_rate: float = 0.001,
+                 period_days: int = 7, generations: int = 8, today: date = None):
+        """
+        Parameters
+        ----------
+        prefix: str
+            필터 파일 경로 prefix
+        capacity: int
+            기간별 필터에 저장할 최대 원소 수
+        error_rate: float
+            기간별 필터의 목표 오탐률 (전체 오탐률은 최대 generations * error_rate)
+        period_days: int
+            필터 하나가 담당하는 기간(일)
+        generations: int
+            조회할 최근 필터 수, 중복 제거 기간은 period_days * generations 일
+        today: date
+            기준 일자 (기본값: 오늘)
+        """
+
+        self._prefix = prefix
+        self._capacity = capacity
+        self._error_rate = error_rate
+        today = date.today() if today is None else today
+        start = today.toordinal() - today.toordinal() % period_days
+        self.current_key = date.fromordinal(start).isoformat()
+        oldest_key = date.fromordinal(start - (generations - 1) * period_days).isoformat()
+
+        self._filters = OrderedDict()
+        dirname, basename = os.path.split(prefix)
+        if os.path.isdir(dirname):
+            for file in sorted(os.listdir(dirname)):
+                match = re.fullmatch(re.escape(basename) + r'\.(\d{4}-\d{2}-\d{2})\.bin', file)
+                if match is None:
+                    continue
+                key = match.group(1)
+                path = f'{dirname}/{file}'
+                if key < oldest_key:
+                    print(f'> Drop expired filter: {path}')
+                    os.remove(path)
+                    continue
+                self._filters[key] = BloomFilter(capacity, error_rate)
+                self._filters[key].load(path)
+        if self.current_key not in self._filters:
+            self._filters[self.current_key] = BloomFilter(capacity, error_rate)
+        ## 마지막 저장 이후 변경 여부
+        self.dirty = False
+
+    def add(self, key: str) -> None:
+        self._filters[self.current_key].add(key)
+        self.dirty = True
+        return
+
+    def __contains__(self, key: str) -> bool:
+        return any(key in bloom for bloom in self._filters.values())
+
+    def fill_ratio(self) -> float:
+        """현재 기간 필터의 fill ratio"""
+        return self._filters[self.current_key].fill_ratio()
+
+    def save(self) -> None:
+        """현재 기간의 필터만 저장한다 (이전 기간 필터는 변경되지 않음)."""
+
+        self._filters[self.current_key].save(f'{self._prefix}.{self.current_key}.bin')
+        self.dirty = False
+        return
+
+class SimHashIndex(object):
+    """본문 simhash(64 bit)를 최근 maxsize개까지 기억하고, 해밍 거리가 distance 이하인
+    유사 본문을 찾는다.
+
+    simhash를 (distance+1)개의 16 bit 구간으로 나누고, 구간마다 해당 구간이 상위 bit가 되도록
+    회전한 값을 정렬된 배열(permuted table)에 저장한다. 유사한 simhash는 적어도 한 구간이
+    일치하므로 각 배열에서 같은 상위 16 bit 범위만 비교하면 된다.
+    """
+
+    def __init__(self, maxsize: int = 100000, distance: int = 3):
+        self.maxsize = maxsize
+        self.distance = distance
+        self._n_bands = distance + 1
+        self._band_bits = 64 // self._n_bands
+        self._tables = [ array('Q') for _ in range(self._n_bands) ]
+        ## 추가된 순서 (오래된 simhash부터 제거)
+        self._order = deque()
+        ## 마지막 저장 이후 변경 여부
+        self.dirty = False
+
+    def _rotate(self, simhash: int, band: int) -> int:
+        """band 번째 구간이 상위 bit가 되도록 회전"""
+
+        shift = (64 - (band + 1) * self._band_bits) % 64
+        return ((simhash << shift) | (simhash >> (64 - shift))) & _MASK64
+
+    def _unrotate(self, value: int, band: int) -> int:
+        shift = (64 - (band + 1) * self._band_bits) % 64
+        return ((value >> shift) | (value << (64 - shift))) & _MASK64
+
+    def find(self, simhash: int) -> int or None:
+        """해밍 거리가 distance 이하인 simhash를 찾는다. 없으면 None"""
+
+        low_bits = 64 - self._band_bits
+        for band, table in enumerate(self._tables):
+            value = self._rotate(simhash, band)
+            prefix = value >> low_bits << low_bits
+            idx = bisect_left(table, prefix)
+            end = bisect_right(table, prefix | ((1 << low_bits) - 1))
+            for other in table[idx:end]:
+                other = self._unrotate(other, band)
+                if bin(simhash ^ other).count('1') <= self.distance:
+                    return other
+        return None
+
+    def __contains__(self, simhash: int) -> bool:
+        return self.find(simhash) is not None
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def add(self, simhash: int) -> None:
+        if self.find(simhash) == simhash:
+            return
+        for band, table in enumerate(self._tables):
+            value = self._rotate(simhash, band)
+            table.insert(bisect_left(table, value), value)
+        self._order.append(simhash)
+        if len(self._order) > self.maxsize:
+            old = self._order.popleft()
+            for band, table in enumerate(self._tables):
+                del table[bisect_left(table, self._rotate(old, band))]
+        self.dirty = True
+        return
+
+    def save(self, path: str) -> None:
+        """simhash를 오래된 순서대로 8 byte씩 저장한다."""
+
+        _atomic_write(path, array('Q', self._order).tobytes())
+        self.dirty = False
+        return
+
+    def load(self, path: str) -> None:
+        """저장된 simhash를 불러온다. 배열은 한 번에 정렬하여 만든다."""
+
+        with open(path, 'rb') as f:
+            data = f.read()
+        if len(data) % 8 != 0:
+            print(f'> [WARNING] Broken simhash index, ignore {path}')
+            return
+        hashes = array('Q')
+        hashes.frombytes(data)
+        self._order = deque(dict.fromkeys(hashes[-self.maxsize:]))
+        self._tables = [ array('Q', sorted(self._rotate(h, band) for h in self._order))
+                         for band in range(self._n_bands) ]
+        self.dirty = False
+        return
+
+## simhash 계산 전 제거할 기사 외 정보 (기자명, 이메일, 언론사 태그, 시각 등)
+_BOILERPLATE = re.compile('|'.join([
+    r'\S+@\S+',                           ## 이메일
+    r'https?://\S+',                      ## url
+    r'\[[^\]]*\]|【[^】]*】',                ## [OO일보], [서울=뉴시스]
+    r'\d{4}[.\-/]\d{1,2}[.\-/]\d{1,2}\.?',  ## 2026.10.19
+    r'\d{1,2}:\d{2}',                     ## 09:00
+    r'[가-힣]{2,4}\s*(?:기자|특파원)',      ## 홍길동 기자
+    r'ⓒ.*$|무단\s*전재.*?금지',            ## 저작권 문구
+]), re.MULTILINE)
+
+def simhash(text: str, shingle: int = 4) -> int:
+    """기자명, 이메일, 시각 등을 제거하고 공백, 문장부호를 없앤 본문의 글자 shingle로
+    64 bit simhash를 계산한다. 재배포 기사는 해밍 거리가 작은 값을 갖는다.
+    """
+
+    normalized = _BOILERPLATE.sub(' ', text)
+    normalized = re.sub(r'[\W_]+', '', normalized).lower()
+    shingles = { normalized[i:i+shingle] for i in range(max(1, len(normalized) - shingle + 1)) }
+    weights = [0] * 64
+    for sh in shingles:
+        h = int.from_bytes(hashlib.md5(sh.encode('utf8')).digest()[:8], 'big')
+        for bit in range(64):
+            weights[bit] += 1 if (h >> bit) & 1 else -1
+
+    return sum(1 << bit for bit in range(64) if weights[bit] > 0)
+
+## 기사 url에서 제거할 목록 관련 파라미터
+_LISTING_PARAMS = {'code', 'page', 'sm', 'clusterId'}
+
+def canonical_url(url: str) -> str:
+    """같은 기사가 종목, 목록 페이지마다 다른 url을 갖지 않도록 정규화한다.
+    네이버 기사 url은 (office_id, article_id)만 남기고, 그 외에는 목록 관련 파라미터를 제거한다.
+    """
+
+    parsed = urlparse(url)
+    query = parse_qs(parsed.query)
+    if 'office_id' in query and 'article_id' in query:
+        params = [('office_id', query['office_id'][0]), ('article_id', query['article_id'][0])]
+    else:
+        params = sorted((key, val) for key, vals in query.items() if key not in _LISTING_PARAMS for val in vals)
+
+    return urlunparse((parsed.scheme, parsed.netloc, parsed.path, '', urlencode(params), ''))
+
+def _iter_gzip_members(f):
+    """파일의 현재 위치부터 gzip member를 하나씩 읽어 (member 끝 위치, 압축 해제된 내용)을 생성한다.
+    마지막 member가 잘려 있거나 깨져 있으면 그 앞에서 멈춘다.
+    """
+
+    pos = f.tell()
+    decomp = zlib.decompressobj(wbits=31)
+    chunks = []
+    buf = b''
+    while True:
+        if buf == b'':
+            buf = f.read(1 << 16)
+            if buf == b'':
+                return
+        try:
+            chunks.append(decomp.decompress(buf))
+        except zlib.error:
+            return
+        if decomp.eof:
+            pos += len(buf) - len(decomp.unused_data)
+            yield pos, b''.join(chunks)
+            buf = decomp.unused_data
+            decomp = zlib.decompressobj(wbits=31)
+            chunks = []
+        else:
+            pos += len(buf)
+            buf = b''
+
+def read_news(path: str, offset: int = 0):
+    """저장된 기사 파일을 읽어 기사를 하나씩 생성한다. 잘린 마지막 member는 무시한다.
+
+    Parameters
+    ----------
+    path: str
+        news.[date].jsonl.gz 파일 경로
+    offset: int
+        읽기 시작할 위치 (gzip member 시작 위치)
+
+    Yields
+    ------
+    dict
+        저장된 기사 혹은 참조 기록
+    """
+
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        for _, data in _iter_gzip_members(f):
+            for line in data.decode('utf8').splitlines():
+                yield json.loads(line)
+
+class NewsCrawler(Crawler):
+    """종목별 뉴스 기사를 크롤링한다.
+
+    기사 목록 -> 기사 본문 -> 중복 제거 -> 저장 단계를 generator로 연결하여
+    한 번에 기사 하나씩만 메모리에 올린다. 중복 제거는 URL(기간별 Bloom filter)과
+    본문 simhash(최근 maxsize개)로 수행하고, 두 상태 모두 파일로 저장되어 일자가 바뀌어도 유지된다.
+    종목 수, 수집 기간과 관계없이 메모리가 일정하다.
+
+    기사는 [news_db]/news.[date].jsonl.gz 파일에 종목별로 gzip member 하나씩 append 된다.
+    이미 저장된 기사가 다른 종목(혹은 다른 url)에서 다시 나오면 본문 없이
+    {'stock_code', 'url', 'title', 'press', 'date'} 참조 기록을 저장하고,
+    유사 본문인 경우 원본의 'simhash'를 'ref_simhash'로 함께 저장한다.
+    """
+
+    def __init__(self, url: str = 'https://finance.naver.com/item/news_news.naver',
+                 news_db: str = '/Users/hanbeomman/Documents/stock/DB/news',
+                 max_pages: int = 5, save_every: int = 50, today: date = None):
+        """
+        Parameters
+        ----------
+        url: str
+            종목별 기사 목록 url (테스트 시 로컬 서버 주소로 대체 가능)
+        news_db: str
+            기사 저장 경로
+        max_pages: int
+            종목별로 조회할 최대 목록 페이지 수
+        save_every: int
+            중복 제거 상태를 저장할 종목 간격
+        today: date
+            수집 일자 (기본값: 오늘), 저장 파일명과 URL 필터 기간에 사용
+        """
+
+        self.url = url
+        self._NEWS_DB = news_db
+        self._max_pages = max_pages
+        self._save_every = save_every
+        self._today = date.today() if today is None else today
+        self._header = {'User-Agent': 'Mozilla/5.0', 'referer': 'http://naver.com'}
+        self._NEWS_PATH = f'{news_db}/news.{self._today.isoformat()}.jsonl.gz'
+        self._SIMHASH_PATH = f'{news_db}/content_simhash.bin'
+        self._STORE_STATE_PATH = f'{news_db}/store_state.json'
+        self._seen_urls = GenerationalBloomFilter(f'{news_db}/url_bloom', today=self._today)
+        self._seen_contents = SimHashIndex()
+        if os.path.exists(self._SIMHASH_PATH):
+            self._seen_contents.load(self._SIMHASH_PATH)
+        self._recover_store()
+
+    def _recover_store(self) -> None:
+        """마지막 상태 저장 이후 append 된 기사를 중복 제거 상태에 반영하고,
+        중단되어 잘린 마지막 gzip member는 잘라낸다.
+        """
+
+        self._committed = 0
+        if not os.path.exists(self._NEWS_PATH):
+            return
+
+        offset = 0
+        if os.path.exists(self._STORE_STATE_PATH):
+            with open(self._STORE_STATE_PATH, 'r', encoding='utf8') as f:
+                state = json.load(f)
+            if state['path'] == self._NEWS_PATH:
+                offset = state['size']
+
+        n_replay = 0
+        end = offset
+        with open(self._NEWS_PATH, 'rb') as f:
+            f.seek(offset)
+            for end, data in _iter_gzip_members(f):
+                for line in data.decode('utf8').splitlines():
+                    self._mark_seen(json.loads(line))
+                    n_replay += 1
+        if n_replay > 0:
+            print(f'> Replay {n_replay} articles stored after last checkpoint')
+
+        size = os.path.getsize(self._NEWS_PATH)
+        if end < size:
+            print(f'> [WARNING] Truncate broken tail of {self._NEWS_PATH}: {size} -> {end} bytes')
+            with open(self._NEWS_PATH, 'r+b') as f:
+                f.truncate(end)
+        self._committed = end
+
+        return
+
+    def _mark_seen(self, record: dict) -> None:
+        """저장된 기사(혹은 참조 기록)를 중복 제거 상태에 추가한다."""
+
+        self._seen_urls.add(f'{record["stock_code"]}|{record["url"]}')
+        self._seen_urls.add(record['url'])
+        if 'simhash' in record:
+            self._seen_contents.add(int(record['simhash'], 16))
+        return
+
+    def _save_state(self) -> None:
+        """변경된 URL 필터, 본문 simhash와 저장 파일의 확정 크기를 저장한다.
+        확정 크기 이후의 기사는 다음 실행 시 _recover_store()에서 다시 반영된다.
+        """
+
+        os.makedirs(self._NEWS_DB, exist_ok=True)
+        if self._seen_urls.dirty:
+            self._seen_urls.save()
+        if self._seen_contents.dirty:
+            self._seen_contents.save(self._SIMHASH_PATH)
+        state = {'path': self._NEWS_PATH, 'size': self._committed}
+        _atomic_write(self._STORE_STATE_PATH, json.dumps(state).encode('utf8'))
+        return
+
+    def _response_text(self, url: str, param: dict = None) -> tuple:
+        """url request를 보내 (status code, html 텍스트)를 받는다.
+        요청 실패 시 status code는 None, status가 비정상일 경우 텍스트는 None
+        """
+
+        try:
+            response = requests.get(url, params=param, headers=self._header, timeout=10)
+        except requests.exceptions.RequestException as e:
+            print(f'Invalid request: {e}')
+            return None, None
+        if response.status_code != 200:
+            print(f'Invalid request: {response.status_code}')
+            return response.status_code, None
+
+        return response.status_code, response.text
+
+    def iter_listing(self, stock_code: str):
+        """종목의 기사 목록을 페이지 순서대로 조회하여 기사 정보를 하나씩 생성한다.
+
+        Parameters
+        ----------
+        stock_code: str
+            주식 고유 코드번호
+
+        Yields
+        ------
+        dict
+            {'stock_code', 'title', 'url', 'link', 'press', 'date'}
+            url은 정규화된 기사 url, link는 목록의 원래 링크
+        """
+
+        for page in range(1, self._max_pages + 1):
+            _, text = self._response_text(self.url, {'code': stock_code, 'page': page})
+            if text is None:
+                return
+            soup = BeautifulSoup(text, 'html.parser')
+            rows = soup.select('table.type5 > tbody > tr')
+            n_new = 0
+            for row in rows:
+                a = row.select_one('td.title > a')
+                if a is None or a.get('href') is None:
+                    continue
+                link = urljoin(self.url, a['href'])
+                article_url = canonical_url(link)
+                ## 이 종목에서 이미 처리한 기사는 본문 요청 전에 걸러 요청 수를 줄임
+                if f'{stock_code}|{article_url}' in self._seen_urls:
+                    continue
+                n_new += 1
+                press = row.select_one('td.info')
+                date_ = row.select_one('td.date')
+                yield {'stock_code': stock_code,
+                       'title': a.get_text().strip(),
+                       'url': article_url,
+                       'link': link,
+                       'press': None if press is None else press.get_text().strip(),
+                       'date': None if date_ is None else date_.get_text().strip()}
+            ## 새 기사가 없는 페이지 이후는 이전 실행에서 처리된 기사
+            if n_new == 0:
+                return
+
+    def _skip_article(self, article: dict, reason: str) -> None:
+        """본문을 얻을 수 없는 기사를 다시 요청하지 않도록 필터에 추가한다."""
+
+        print(f'> [WARNING] Skip article ({reason}): {article["url"]}')
+        self._seen_urls.add(f'{article["stock_code"]}|{article["url"]}')
+        self._seen_urls.add(f'!{article["url"]}')
+        return
+
+    def iter_articles(self, listing):
+        """기사 정보에 본문을 채워 하나씩 생성한다.
+        다른 종목에서 이미 저장된 기사는 본문을 요청하지 않고 그대로 생성한다.
+
+        Parameters
+        ----------
+        listing: iterable of dict
+            iter_listing()이 생성한 기사 정보
+
+        Yields
+        ------
+        dict
+            'text' 항목이 추가된 기사 정보 (이미 저장된 기사는 'text' 없음)
+        """
+
+        for article in listing:
+            if f'!{article["url"]}' in self._seen_urls:
+                self._skip_article(article, 'failed before')
+                continue
+            if article['url'] in self._seen_urls:
+                yield article
+                continue
+
+            status, text = self._response_text(article.pop('link'))
+            if text is None:
+                ## 요청 실패, 서버 오류는 다음 실행에서 다시 시도
+                if status is not None and 400 <= status < 500 and status != 429:
+                    self._skip_article(article, f'status {status}')
+                continue
+            soup = BeautifulSoup(text, 'html.parser')
+            ## 기사 본문 영역이 없으면 페이지 전체(메뉴, 광고 등)를 저장하지 않도록 건너뜀
+            body = soup.select_one('#news_read') or soup.select_one('article')
+            if body is None:
+                self._skip_article(article, 'no article body')
+                continue
+            for tag in body.select('script, style, iframe'):
+                tag.decompose()
+            article['text'] = re.sub(r'\s+', ' ', body.get_text()).strip()
+            if article['text'] == '':
+                self._skip_article(article, 'empty article body')
+                continue
+            yield article
+
+    def dedup(self, articles):
+        """이미 저장된 기사, 본문이 유사한 기사는 본문 없는 참조 기록으로 바꾼다.
+
+        Parameters
+        ----------
+        articles: iterable of dict
+            iter_articles()가 생성한 기사
+
+        Yields
+        ------
+        dict
+            처음 수집된 기사 ('simhash' 포함) 혹은 참조 기록
+        """
+
+        for article in articles:
+            article.pop('link', None)
+            text = article.pop('text', None)
+            if text is not None:
+                content_key = simhash(text)
+                ref_key = self._seen_contents.find(content_key)
+                if ref_key is not None:
+                    article['ref_simhash'] = f'{ref_key:016x}'
+                else:
+                    article['simhash'] = f'{content_key:016x}'
+                    article['text'] = text
+            self._mark_seen(article)
+            yield article
+
+    def store(self, articles) -> int:
+        """기사를 gzip member 하나로 압축하여 일자별 파일에 한 번에 append 한다.
+        쓰기가 끝나면 fsync 하므로, 중단되더라도 잘리는 것은 마지막 member 뿐이다.
+
+        Parameters
+        ----------
+        articles: iterable of dict
+            저장할 기사 (한 종목분)
+
+        Returns
+        -------
+        int
+            저장된 기사 수
+        """
+
+        lines = [ json.dumps(article, ensure_ascii=False) + '\n' for article in articles ]
+        ## 저장할 기사가 없으면 빈 gzip member가 쌓이지 않도록 파일을 열지 않음
+        if len(lines) == 0:
+            return 0
+
+        os.makedirs(self._NEWS_DB, exist_ok=True)
+        data = gzip.compress(''.join(lines).encode('utf8'))
+        with open(self._NEWS_PATH, 'ab') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+            self._committed = f.tell()
+
+        return len(lines)
+
+    def crawl_news(self, corps: list) -> None:
+        """기업 리스트를 받아 종목별 기사를 수집, 저장한다.
+
+        Parameters
+        ----------
+        corps: list of tuples
+            (기업코드, 기업명, 상장코드, 수정일) 리스트
+        """
+
+        ## 중단된 경우에는 저장하지 않은 기사가 필터에 들어 있을 수 있으므로 상태를 저장하지 않는다.
+        ## 마지막 상태 저장 이후 저장된 기사는 다음 실행 시 _recover_store()에서 반영된다.
+        for curr, corp in enumerate(corps):
+            corp_name = corp[1]
+            stock_code = corp[2]
+            print(f'> Process {curr+1}th corp news: {corp_name}...')
+            n_stored = self.store(self.dedup(self.iter_articles(self.iter_listing(stock_code))))
+            fill_ratio = self._seen_urls.fill_ratio()
+            print(f'> Store {n_stored} articles (URL filter fill ratio: {fill_ratio:.3f})')
+            if fill_ratio > 0.5:
+                print(f'> [WARNING] URL filter is over capacity, false positive rate increases')
+            if (curr+1) % self._save_every == 0:
+                self._save_state()
+        self._save_state()
+
+        return
+
+    @property
+    def url(self) -> str:
+        """url getter method"""
+        return self._url
+
+    @url.setter
+    def url(self, _url: str) -> None:
+        self._url = _url
+        return
+
+if __name__ == '__main__':
+    print(f'> [WARNING] This code is not intended for running script...')
+    print(f'> [WARNING] We recommend using this code at other running scripts...')
+    print(f'> [WARNING] Anyway... Running...')
+
+    #crawler = NewsCrawler()
+    #crawler.crawl_news([('00126380', '삼성전자', '005930', '')])
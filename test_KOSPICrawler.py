@@ -0,0 +1,152 @@
+import sys, types
+
+import pytest
+import requests
+
+## dart_fss는 레이아웃 파싱에 사용되지 않으므로 설치되지 않은 환경에서도 import 가능하도록 함
+sys.modules.setdefault('dart_fss', types.ModuleType('dart_fss'))
+
+from KOSPICrawler import KOSPICrawler, LayoutChangedError
+
+SUMMARY = '''
+<div id="tab_con1"><div class="first"><table>
+<tr><th>시가총액</th><td><em id="_market_sum">4,123,456</em>억원</td></tr>
+<tr><th>시가총액순위</th><td>코스피 <em>1</em>위</td></tr>
+<tr><th>상장주식수</th><td><em>5,969,782,550</em></td></tr>
+<tr><th>액면가<span>l</span>매매단위</th><td><em>100</em>원</td></tr>
+</table></div></div>
+'''
+
+LABELS = ['매출액', '영업이익', '당기순이익', '영업이익률', '순이익률', 'ROE(지배주주)',
+          '부채비율', '당좌비율', '유보율', 'EPS(원)', 'PER(배)', 'BPS(원)', 'PBR(배)']
+
+def _analysis(labels=LABELS, annual=('2019.12', '2020.12', '2021.12', '2022.12(E)'),
+              quarter=('2021.09', '2021.12', '2022.03(E)')):
+    """행 번호 x 10 + 열 번호 값을 갖는 기업실적분석 테이블"""
+
+    periods = list(annual) + list(quarter)
+    head = ('<thead><tr><th rowspan="2">주요재무정보</th>'
+            f'<th colspan="{len(annual)}">최근 연간 실적</th><th colspan="{len(quarter)}">최근 분기 실적</th></tr>'
+            '<tr>' + ''.join(f'<th>{p}</th>' for p in periods) + '</tr></thead>')
+    rows = ''.join(f'<tr><th>{label}</th>' + ''.join(f'<td>{(r+1)*10+c+1}</td>' for c in range(len(periods))) + '</tr>'
+                   for r, label in enumerate(labels))
+    return (f'<div class="section cop_analysis"><div class="sub_section"><table>'
+            f'{head}<tbody>{rows}</tbody></table></div></div>')
+
+def _page(summary=SUMMARY, analysis=None):
+    return f'<html><body>{summary}{_analysis() if analysis is None else analysis}</body></html>'
+
+def _response(html, status=200):
+    response = requests.models.Response()
+    response.status_code = status
+    response._content = html.encode('utf8')
+    response.encoding = 'utf8'
+    return response
+
+@pytest.fixture
+def crawler(monkeypatch):
+    crawler = KOSPICrawler()
+    crawler.pages = []
+    monkeypatch.setattr(crawler, '_response_url', lambda url, params_: crawler.pages.pop(0))
+    return crawler
+
+def _scrap(crawler, html, status=200):
+    crawler.pages.append(_response(html, status))
+    return crawler._scrap_naver_fin_page('00126380', '삼성전자', '005930')
+
+def test_layout_map(crawler):
+    corp_fin = _scrap(crawler, _page())
+
+    ## 라벨 정규화 ('PER(배)' -> 'PER'), colspan 그룹 확장, 추정치(E) 열 제외
+    layout = list(crawler._layouts.values())[0]
+    assert layout['summary'] == {'stocks_listed': 3}
+    assert layout['rows']['roe'] == 6
+    assert layout['rows']['per'] == 11
+    assert layout['rows']['pbr'] == 13
+    assert layout['cols'] == [1, 2, 3]
+
+    assert corp_fin.market_capital == '4,123,456'
+    assert corp_fin.stocks_listed == 5969782550
+    assert corp_fin.revenue == {'2019.12': 11, '2020.12': 12, '2021.12': 13}
+    assert corp_fin.per == {'2019.12': 111, '2020.12': 112, '2021.12': 113}
+    assert corp_fin.pbr == {'2019.12': 131, '2020.12': 132, '2021.12': 133}
+
+def test_layout_reordered(crawler):
+    ## 행 순서, 연간 열 수가 달라도 label로 찾음
+    labels = ['PBR(배)'] + [label for label in LABELS if label != 'PBR(배)']
+    corp_fin = _scrap(crawler, _page(analysis=_analysis(labels, annual=('2020.12', '2021.12', '2022.12(E)'))))
+    assert corp_fin.pbr == {'2020.12': 11, '2021.12': 12}
+    assert corp_fin.revenue == {'2020.12': 21, '2021.12': 22}
+
+def test_layout_cache(crawler):
+    _scrap(crawler, _page())
+    layout = list(crawler._layouts.values())[0]
+
+    ## 같은 지문의 페이지는 label을 다시 탐색하지 않으므로, 없는 label이 추가되어도 캐시된 맵을 사용
+    crawler._FIN_LABELS['unknown'] = '없는항목'
+    corp_fin = _scrap(crawler, _page(analysis=_analysis(annual=('2020.12', '2021.12', '2022.12', '2023.12(E)'))))
+    assert list(crawler._layouts.values()) == [layout]
+    assert corp_fin.per == {'2020.12': 111, '2021.12': 112, '2022.12': 113}
+
+    ## 새 지문이면 label을 다시 탐색
+    with pytest.raises(LayoutChangedError, match='없는항목'):
+        _scrap(crawler, _page(analysis=_analysis(annual=('2021.12', '2022.12(E)'))))
+
+def test_layout_fingerprint_ignores_years(crawler):
+    _scrap(crawler, _page())
+    _scrap(crawler, _page(analysis=_analysis(annual=('2020.03', '2021.03', '2022.03', '2023.03(E)'))))
+    assert len(crawler._layouts) == 1
+
+    ## 열 구조가 바뀌면 다른 지문
+    _scrap(crawler, _page(analysis=_analysis(annual=('2020.12', '2021.12(E)', '2022.12', '2023.12'))))
+    assert len(crawler._layouts) == 2
+
+def test_missing_label(crawler):
+    labels = [label for label in LABELS if label != 'PER(배)']
+    with pytest.raises(LayoutChangedError, match='PER'):
+        _scrap(crawler, _page(analysis=_analysis(labels)))
+
+def test_missing_summary_label(crawler):
+    summary = SUMMARY.replace('상장주식수', '발행주식수')
+    with pytest.raises(LayoutChangedError, match='상장주식수'):
+        _scrap(crawler, _page(summary=summary))
+
+def test_empty_table(crawler):
+    analysis = '<div class="section cop_analysis"><div class="sub_section"><table></table></div></div>'
+    with pytest.raises(LayoutChangedError, match='no rows'):
+        _scrap(crawler, _page(analysis=analysis))
+
+def test_no_annual_columns(crawler):
+    with pytest.raises(LayoutChangedError, match='no annual columns'):
+        _scrap(crawler, _page(analysis=_analysis(annual=('2022.12(E)',))))
+
+def test_abort_after_bad_pages(crawler):
+    ## 기업실적분석 섹션이 없는 페이지는 연속 10번째에 중단
+    for _ in range(9):
+        corp_fin = _scrap(crawler, _page(analysis=''))
+        assert corp_fin.stocks_listed == 5969782550
+        assert corp_fin.revenue is None
+    with pytest.raises(LayoutChangedError):
+        _scrap(crawler, _page(analysis=''))
+
+def test_bad_page_count_reset(crawler):
+    for _ in range(9):
+        _scrap(crawler, _page(analysis=''))
+    _scrap(crawler, _page())
+    assert crawler._bad_page_count == 0
+
+def test_abort_invalid_response(crawler):
+    ## 요청 차단(비정상 응답), 요약 테이블이 없는 페이지도 함께 셈
+    for _ in range(5):
+        _scrap(crawler, '', status=403)
+    for _ in range(4):
+        _scrap(crawler, '<html><body></body></html>')
+    with pytest.raises(LayoutChangedError):
+        _scrap(crawler, _page(summary=SUMMARY.replace('5,969,782,550', '')))
+
+def test_crawl_abort(crawler, capsys):
+    crawler.pages = [_response('', status=403) for _ in range(10)] + [_response(_page())]
+    corps = [('00126380', '삼성전자', '005930', '')] * 11
+    crawler.crawl_naver_fin(corps)
+    assert len(crawler.pages) == 1
+    assert 'Abort crawling at 10th corp' in capsys.readouterr().out
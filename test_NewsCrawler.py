@@ -0,0 +1,231 @@
+import os, json, gzip, threading
+from datetime import date, timedelta
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+import pytest
+
+from NewsCrawler import NewsCrawler, GenerationalBloomFilter, SimHashIndex, simhash, canonical_url, read_news
+
+BODY = ('삼성전자가 3분기 잠정 실적을 발표했다. 매출액은 전년 동기 대비 증가했으며 '
+        '영업이익은 반도체 부문의 회복에 힘입어 시장 예상치를 웃돌았다. '
+        '메모리 가격 상승과 고부가 제품 판매 확대가 실적 개선을 이끌었다는 분석이 나온다. '
+        '회사는 4분기에도 서버용 수요가 견조할 것으로 내다봤다. '
+        '스마트폰 사업은 신제품 출시 효과로 출하량이 늘었지만 마케팅 비용 증가로 수익성은 '
+        '소폭 하락했다. 디스플레이 부문은 주요 고객사의 신규 모델 효과로 흑자 폭을 키웠고, '
+        '가전 부문은 원자재 가격 안정에도 수요 부진이 이어지며 전 분기와 비슷한 수준에 머물렀다. '
+        '증권가에서는 고대역폭 메모리 공급 확대가 내년 실적의 핵심 변수가 될 것으로 보고 있으며, '
+        '파운드리 부문의 적자 축소 여부도 주목해야 한다고 조언했다. 회사 측은 시설 투자 계획을 '
+        '유지하면서 주주 환원 정책도 차질 없이 이행하겠다고 밝혔다.')
+
+## a3은 a1을 다른 언론사가 재배포한 기사 (언론사, 기자명, 시각만 다름), a5는 본문이 없는 페이지
+ARTICLES = {
+    'a1': f'{BODY} 홍길동 기자 hong@press-a.com 2026.10.19 09:00',
+    'a2': ('현대차가 미국 공장 증설 계획을 밝혔다. 전기차 수요에 대응하기 위해 생산 능력을 '
+           '두 배로 늘리고 배터리 합작 법인과의 협력도 강화할 예정이다.'),
+    'a3': f'[B일보] {BODY} 김철수 기자 kim@press-b.com 2026.10.19 10:30',
+    'a4': ('한국은행이 기준금리를 동결했다. 물가 상승률이 둔화되고 있으나 가계부채 증가세를 '
+           '고려해 당분간 현 수준을 유지하겠다는 입장이다.'),
+    'a5': None,
+    'a6': ('SK하이닉스가 고대역폭 메모리 신제품 양산을 시작했다. 주요 고객사 인증을 마쳤으며 '
+           '내년 상반기까지 공급 물량을 두 배로 늘릴 계획이다.'),
+}
+
+## 종목별 목록 페이지의 기사
+## 005930: 3페이지는 모두 이미 처리된 기사, 000660: a1은 005930에서 이미 저장된 기사
+PAGES = {
+    '005930': {1: ['a1', 'a2', 'a3', 'a5'], 2: ['a2', 'a4'], 3: ['a1', 'a4'], 4: ['a2']},
+    '000660': {1: ['a1', 'a6'], 2: ['a1'], 3: ['a6']},
+}
+
+class FeedHandler(BaseHTTPRequestHandler):
+    """네이버 종목 뉴스 목록/기사 페이지를 흉내내는 로컬 서버"""
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        query = parse_qs(parsed.query)
+        self.server.requests.append(self.path)
+        if parsed.path == '/list':
+            code = query['code'][0]
+            page = int(query['page'][0])
+            rows = ''.join(f'<tr><td class="title"><a href="/read?article_id={a_id}&office_id=001'
+                           f'&code={code}&page={page}&sm=title_entity_id.basic">{a_id}</a></td>'
+                           f'<td class="info">press</td><td class="date">2026.10.19</td></tr>'
+                           for a_id in PAGES[code].get(page, []))
+            html = f'<html><body><table class="type5"><tbody>{rows}</tbody></table></body></html>'
+        elif parsed.path == '/read':
+            text = ARTICLES[query['article_id'][0]]
+            html = '<html><body><div class="nav">메뉴 광고</div>'
+            if text is not None:
+                html += f'<div id="news_read">{text}<script>var ad = 1;</script></div>'
+            html += '</body></html>'
+        else:
+            self.send_response(404)
+            self.end_headers()
+            return
+        data = html.encode('utf8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def feed():
+    server = HTTPServer(('127.0.0.1', 0), FeedHandler)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+TODAY = date(2026, 10, 19)
+CORPS = [('00126380', '삼성전자', '005930', ''), ('00164779', 'SK하이닉스', '000660', '')]
+
+def _news_path(news_db):
+    return f'{news_db}/news.{TODAY.isoformat()}.jsonl.gz'
+
+def _article_id(url):
+    return parse_qs(urlparse(url).query)['article_id'][0]
+
+def _listing_pages(server, code):
+    pages = []
+    for path in server.requests:
+        query = parse_qs(urlparse(path).query)
+        if path.startswith('/list') and query['code'][0] == code:
+            pages.append(int(query['page'][0]))
+    return pages
+
+def _read_ids(server):
+    return [_article_id(path) for path in server.requests if path.startswith('/read')]
+
+def _distance(text1, text2):
+    return bin(simhash(text1) ^ simhash(text2)).count('1')
+
+def test_crawl_news_dedup(feed, tmp_path):
+    url = f'http://127.0.0.1:{feed.server_port}/list'
+
+    crawler = NewsCrawler(url=url, news_db=str(tmp_path), max_pages=5, today=TODAY)
+    crawler.crawl_news(CORPS)
+
+    stored = list(read_news(_news_path(tmp_path)))
+    full = [ (r['stock_code'], _article_id(r['url'])) for r in stored if 'text' in r ]
+    refs = [ (r['stock_code'], _article_id(r['url'])) for r in stored if 'text' not in r ]
+    simhashes = { _article_id(r['url']): r['simhash'] for r in stored if 'simhash' in r }
+
+    ## URL 중복 제거, 본문 없는 a5 제외, 목록 파라미터가 제거된 url
+    assert full == [('005930', 'a1'), ('005930', 'a2'), ('005930', 'a4'), ('000660', 'a6')]
+    assert stored[0]['url'] == f'http://127.0.0.1:{feed.server_port}/read?office_id=001&article_id=a1'
+    assert '메뉴' not in stored[0]['text'] and 'var ad' not in stored[0]['text']
+
+    ## 유사 본문(a3), 다른 종목에서 저장된 기사(a1)는 참조 기록으로 저장
+    assert refs == [('005930', 'a3'), ('000660', 'a1')]
+    assert stored[2]['ref_simhash'] == simhashes['a1']
+
+    ## 모든 기사 본문은 한 번만 요청하고, 새 기사가 없는 페이지에서 중단
+    assert sorted(_read_ids(feed)) == ['a1', 'a2', 'a3', 'a4', 'a5', 'a6']
+    assert _listing_pages(feed, '005930') == [1, 2, 3]
+    assert _listing_pages(feed, '000660') == [1, 2]
+
+    ## 다음 실행은 저장된 상태를 불러와 첫 페이지에서 중단 (본문이 없던 a5도 다시 요청하지 않음)
+    size = os.path.getsize(_news_path(tmp_path))
+    feed.requests.clear()
+    crawler = NewsCrawler(url=url, news_db=str(tmp_path), max_pages=5, today=TODAY)
+    crawler.crawl_news(CORPS)
+    assert _listing_pages(feed, '005930') == [1]
+    assert _listing_pages(feed, '000660') == [1]
+    assert _read_ids(feed) == []
+    assert os.path.getsize(_news_path(tmp_path)) == size
+
+def test_canonical_url():
+    url = 'https://finance.naver.com/item/news_read.naver?article_id=0005&office_id=001&code=005930&page=2&sm=title_entity_id.basic'
+    assert canonical_url(url) == 'https://finance.naver.com/item/news_read.naver?office_id=001&article_id=0005'
+    assert canonical_url('https://news.example.com/view?page=3&id=7&code=000660') == 'https://news.example.com/view?id=7'
+
+def test_simhash_distance():
+    ## 재배포 기사는 임계값(3)보다 충분히 가깝고, 무관한 기사는 충분히 멀어야 함
+    assert _distance(ARTICLES['a1'], ARTICLES['a3']) <= 1
+    assert _distance(ARTICLES['a1'], ARTICLES['a2']) >= 16
+    assert _distance(ARTICLES['a2'], ARTICLES['a4']) >= 16
+
+    ## 같은 언론사 문구를 공유하는 서로 다른 짧은 기사는 구분되어야 함
+    short1 = ('[한국경제] 코스피가 외국인 매수세에 힘입어 2% 상승 마감했다. '
+              '홍길동 기자 hong@hankyung.com ⓒ 한국경제, 무단전재 및 재배포 금지')
+    short2 = ('[한국경제] 원달러 환율이 10원 넘게 급락해 1,300원대로 내려왔다. '
+              '홍길동 기자 hong@hankyung.com ⓒ 한국경제, 무단전재 및 재배포 금지')
+    assert _distance(short1, short2) >= 16
+
+def test_simhash_index(tmp_path):
+    index = SimHashIndex(maxsize=3)
+    base = simhash(BODY)
+    index.add(base)
+    assert index.find(base ^ 0b111) == base
+    assert index.find(base ^ 0b1111) is None
+    assert index.find(base ^ (1 << 63) ^ (1 << 40) ^ (1 << 20)) == base
+
+    ## 오래된 simhash부터 제거
+    for text in ('a2', 'a4', 'a6'):
+        index.add(simhash(ARTICLES[text]))
+    assert len(index) == 3
+    assert base not in index
+
+    index.save(f'{tmp_path}/simhash.bin')
+    loaded = SimHashIndex(maxsize=3)
+    loaded.load(f'{tmp_path}/simhash.bin')
+    assert len(loaded) == 3
+    assert simhash(ARTICLES['a6']) in loaded
+    assert base not in loaded
+
+def test_store_append(tmp_path):
+    crawler = NewsCrawler(url='http://127.0.0.1/list', news_db=str(tmp_path), today=TODAY)
+
+    assert crawler.store(iter([])) == 0
+    assert not os.path.exists(_news_path(tmp_path))
+
+    assert crawler.store(iter([{'stock_code': '005930', 'url': 'u1', 'text': '첫 번째'}])) == 1
+    assert crawler.store(iter([{'stock_code': '005930', 'url': 'u2', 'text': '두 번째'},
+                               {'stock_code': '005930', 'url': 'u3', 'text': '세 번째'}])) == 2
+    with gzip.open(_news_path(tmp_path), 'rt', encoding='utf8') as f:
+        assert [json.loads(line)['url'] for line in f] == ['u1', 'u2', 'u3']
+
+def test_store_recover(tmp_path):
+    crawler = NewsCrawler(url='http://127.0.0.1/list', news_db=str(tmp_path), today=TODAY)
+    crawler.store(iter([{'stock_code': '005930', 'url': 'u1', 'text': '첫 번째'}]))
+    crawler._save_state()
+
+    ## 상태 저장 전에 중단: 두 번째 member는 온전하고 세 번째 member는 잘림
+    crawler.store(iter([{'stock_code': '005930', 'url': 'u2', 'text': '두 번째', 'simhash': f'{simhash(BODY):016x}'}]))
+    size = os.path.getsize(_news_path(tmp_path))
+    with open(_news_path(tmp_path), 'ab') as f:
+        f.write(gzip.compress(b'{"stock_code": "005930", "url": "u3"}\n')[:-6])
+    assert [r['url'] for r in read_news(_news_path(tmp_path))] == ['u1', 'u2']
+
+    ## 다음 실행은 잘린 member를 잘라내고, 상태 저장 이후 저장된 기사를 중복 제거 상태에 반영
+    crawler = NewsCrawler(url='http://127.0.0.1/list', news_db=str(tmp_path), today=TODAY)
+    assert os.path.getsize(_news_path(tmp_path)) == size
+    assert '005930|u2' in crawler._seen_urls
+    assert 'u2' in crawler._seen_urls
+    assert simhash(BODY) in crawler._seen_contents
+
+    crawler.store(iter([{'stock_code': '005930', 'url': 'u4', 'text': '네 번째'}]))
+    with gzip.open(_news_path(tmp_path), 'rt', encoding='utf8') as f:
+        assert [json.loads(line)['url'] for line in f] == ['u1', 'u2', 'u4']
+
+def test_url_filter_expire(tmp_path):
+    prefix = f'{tmp_path}/url_bloom'
+    today = date(2026, 10, 19)
+
+    seen = GenerationalBloomFilter(prefix, capacity=1000, period_days=7, generations=2, today=today)
+    seen.add('http://news/1')
+    seen.save()
+
+    seen = GenerationalBloomFilter(prefix, capacity=1000, period_days=7, generations=2, today=today + timedelta(days=7))
+    assert 'http://news/1' in seen
+
+    seen = GenerationalBloomFilter(prefix, capacity=1000, period_days=7, generations=2, today=today + timedelta(days=14))
+    assert 'http://news/1' not in seen
+    assert len(os.listdir(tmp_path)) == 0